@@ -2,7 +2,7 @@
 Rule Cleaning and Validation Tool for Fashion Rules.
 """
 
-import json
+import orjson
 import re
 from pathlib import Path
 from typing import List, Dict, Any
@@ -12,6 +12,8 @@ from dataclasses import dataclass
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_ADVICE_RE = re.compile(r'should|must|avoid|always|never|try|consider|recommended')
+
 @dataclass
 class RuleValidationConfig:
     min_word_count: int = 5
@@ -71,6 +73,15 @@ class RuleValidationConfig:
 class RuleCleaner:
     def __init__(self, config: RuleValidationConfig = None):
         self.config = config or RuleValidationConfig()
+        # Each phrase list becomes one alternation, so a rule is scanned once per list
+        self._promotional_re = self._compile_alternation(self.config.promotional_phrases, re.IGNORECASE)
+        self._navigational_re = self._compile_alternation(self.config.navigational_phrases, re.IGNORECASE)
+        self._keyword_re = self._compile_alternation(map(re.escape, self.config.required_keywords))
+
+    @staticmethod
+    def _compile_alternation(patterns, flags: int = 0) -> re.Pattern:
+        # Group each alternative so patterns containing '|' keep their meaning
+        return re.compile('|'.join(f'(?:{p})' for p in patterns), flags)
     
     def clean_rules(self, input_file: str, output_file: str = None) -> Dict[str, Any]:
         """Clean and validate fashion rules from input file."""
@@ -78,8 +89,7 @@ class RuleCleaner:
             raise FileNotFoundError(f"Input file not found: {input_file}")
         
         # Load rules
-        with open(input_file, 'r') as f:
-            data = json.load(f)
+        data = orjson.loads(Path(input_file).read_bytes())
         
         original_count = len(data.get('rules', []))
         logger.info(f"Processing {original_count} rules...")
@@ -116,8 +126,7 @@ class RuleCleaner:
         
         # Save if output file specified
         if output_file:
-            with open(output_file, 'w') as f:
-                json.dump(output_data, f, indent=2)
+            Path(output_file).write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
             logger.info(f"Saved cleaned rules to: {output_file}")
         
         # Print summary
@@ -142,19 +151,19 @@ class RuleCleaner:
             reasons.append(f"Low quality score: {quality_score}")
         
         # Check for promotional content
-        if any(re.search(pattern, text, re.IGNORECASE) for pattern in self.config.promotional_phrases):
+        if self._promotional_re.search(text):
             reasons.append("Contains promotional content")
         
         # Check for navigational content
-        if any(re.search(pattern, text, re.IGNORECASE) for pattern in self.config.navigational_phrases):
+        if self._navigational_re.search(text):
             reasons.append("Contains navigational content")
         
         # Check for required keywords
-        if not any(keyword in text for keyword in self.config.required_keywords):
+        if not self._keyword_re.search(text):
             reasons.append("No fashion-related keywords found")
         
         # Additional checks for actual advice content
-        if not any(word in text for word in ["should", "must", "avoid", "always", "never", "try", "consider", "recommended"]):
+        if not _ADVICE_RE.search(text):
             reasons.append("No advice indicators found")
         
         return {
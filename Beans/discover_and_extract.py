@@ -9,15 +9,19 @@
 This module intentionally avoids heavy LLM calls and uses deterministic heuristics + embeddings for classification and standardization.
 """
 
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Tuple
 from urllib.parse import urljoin, urlparse
-import requests
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+import orjson
 import time
 import logging
+from collections import deque
 import re
 from pathlib import Path
 
+from http_session import make_session, read_page_text
+
 try:
     from sentence_transformers import SentenceTransformer
     from sklearn.metrics.pairwise import cosine_similarity
@@ -30,16 +34,33 @@ logging.basicConfig(level=logging.INFO)
 
 DEFAULT_KEYWORDS = ["guide", "rules", "how", "do", "dont", "tips", "tutorial", "etiquette", "fit", "style", "ways", "ways-to", "dos-and-donts"]
 
+_NUMBERED_LINE_RE = re.compile(r'^(\d+\.|\d+\))\s+')
+_NUMBER_SPLIT_RE = re.compile(r'\d+\.|\d+\)')
+_DIRECTIVE_RE = re.compile(r'should|never|always|avoid|must')
+# Candidates only come from <p> and <li>; pages without either are not parsed
+_CANDIDATE_TAG_RE = re.compile(r'<(?:p|li)\b', re.IGNORECASE)
+# Only link targets are needed during discovery; lxml evaluates this in C
+_HREFS_XPATH = '//a/@href'
+# Pages are already decoded to str, so lxml gets UTF-8 bytes and must ignore
+# any <?xml encoding=...?> declaration (it rejects such declarations in str input)
+_UTF8_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
 class DiscoverExtract:
+    _STRIP_TAGS = ('script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'iframe')
+    _CONTENT_SELECTORS = ('article', '.article', '.post-content', '.entry-content', '.content', 'main')
+    # urllib3's Retry has already slept on Retry-After; only a short extra pause is kept here
+    _MAX_RETRY_AFTER = 60.0
+
     def __init__(self, model_name: str = 'all-MiniLM-L6-v2', max_pages: int = 80, delay: float = 0.5):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = make_session({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5'
         })
         self.max_pages = max_pages
         self.delay = delay
+        # Earliest monotonic time the next request to each host may start
+        self._next_request_at: Dict[str, float] = {}
         self.model = None
         if SentenceTransformer is not None:
             try:
@@ -60,65 +81,94 @@ class DiscoverExtract:
 
     def discover_urls_from_domain(self, seed: str, keywords: List[str] = None) -> List[str]:
         """Discover candidate URLs within the same domain that contain keywords in path or subdomain."""
-        keywords = keywords or DEFAULT_KEYWORDS
+        keywords = tuple(keywords or DEFAULT_KEYWORDS)
         parsed = urlparse(seed if seed.startswith('http') else f'https://{seed}')
         base = f"{parsed.scheme}://{parsed.netloc}"
-        to_visit = [base]
+        host_matches = any(k in parsed.netloc for k in keywords)
+        # One alternation scan per link path instead of a substring test per keyword
+        keyword_re = re.compile('|'.join(map(re.escape, keywords)))
+        to_visit = deque([base])
+        queued: Set[str] = {base}
         seen: Set[str] = set()
         candidates: List[str] = []
+        candidate_set: Set[str] = set()
 
         while to_visit and len(seen) < self.max_pages:
-            url = to_visit.pop(0)
+            url = to_visit.popleft()
+            queued.discard(url)
             if url in seen:
                 continue
             seen.add(url)
             try:
-                time.sleep(self.delay)
-                resp = self.session.get(url, timeout=10)
-                if resp.status_code != 200:
+                status, html = self._get(url)
+                if status != 200:
                     continue
-                soup = BeautifulSoup(resp.text, 'html.parser')
                 # Find links
-                for a in soup.find_all('a', href=True):
-                    href = a['href']
+                doc = lxml_html.fromstring(html.encode('utf-8'), parser=_UTF8_HTML_PARSER)
+                for href in doc.xpath(_HREFS_XPATH):
                     full = urljoin(base, href)
                     p = urlparse(full)
                     if p.netloc != parsed.netloc:
                         continue
                     path = p.path.lower()
                     # If path or subdomain contains keywords, add to candidates
-                    if any(k in path for k in keywords) or any(k in p.netloc for k in keywords):
-                        if full not in candidates:
+                    if host_matches or keyword_re.search(path):
+                        if full not in candidate_set:
+                            candidate_set.add(full)
                             candidates.append(full)
                     # enqueue for crawl if not deep
-                    if full not in seen and full not in to_visit and len(seen) + len(to_visit) < self.max_pages:
+                    if full not in seen and full not in queued and len(seen) + len(to_visit) < self.max_pages:
                         to_visit.append(full)
+                        queued.add(full)
             except Exception as e:
                 logger.debug(f"Error discovering {url}: {e}")
                 continue
         logger.info(f"Discovered {len(candidates)} candidate pages on {parsed.netloc}")
         return candidates
 
+    def _get(self, url: str) -> Tuple[int, str]:
+        """GET `url`, waiting only as long as its host's delay still requires.
+
+        Returns the status code and the (size-capped) page text, which is
+        empty for non-200 and non-HTML responses.
+        """
+        host = urlparse(url).netloc
+        wait = self._next_request_at.get(host, 0.0) - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        delay = self.delay
+        try:
+            with self.session.get(url, timeout=10, stream=True) as resp:
+                html = read_page_text(resp) if resp.status_code == 200 else ''
+            retry_after = resp.headers.get('Retry-After', '')
+            if resp.status_code in (429, 503) and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self._MAX_RETRY_AFTER))
+        finally:
+            # Timeouts and exhausted retries still hold the host off for the delay
+            self._next_request_at[host] = time.monotonic() + delay
+        return resp.status_code, html
+
     def fetch_page(self, url: str) -> str:
         try:
-            time.sleep(self.delay)
-            resp = self.session.get(url, timeout=10)
-            if resp.status_code == 200:
-                return resp.text
-            logger.debug(f"Non-200 {resp.status_code} for {url}")
+            status, html = self._get(url)
+            if status == 200:
+                return html
+            logger.debug(f"Non-200 {status} for {url}")
         except Exception as e:
             logger.debug(f"Fetch failed {url}: {e}")
         return ""
 
     def extract_candidates(self, html: str, source: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, 'html.parser')
+        if not _CANDIDATE_TAG_RE.search(html):
+            return []
+        soup = BeautifulSoup(html, 'lxml')
         # remove scripts/styles
-        for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'iframe']):
+        for tag in soup(self._STRIP_TAGS):
             tag.decompose()
 
         # try article-like blocks
         content = None
-        for selector in ['article', '.article', '.post-content', '.entry-content', '.content', 'main']:
+        for selector in self._CONTENT_SELECTORS:
             el = soup.select_one(selector)
             if el:
                 content = el
@@ -136,14 +186,14 @@ class DiscoverExtract:
         for p in content.find_all(['p', 'li']):
             line = ' '.join(p.stripped_strings)
             # look for numbered start or bullet-like
-            if re.match(r'^(\d+\.|\d+\))\s+', line) and len(line) > 30:
+            if len(line) > 30 and _NUMBERED_LINE_RE.match(line):
                 # split on numbered prefixes
-                parts = re.split(r'\d+\.|\d+\)', line)
+                parts = _NUMBER_SPLIT_RE.split(line)
                 for part in parts:
                     t = part.strip()
                     if len(t) > 30:
                         candidates.append({'text': t, 'source': source})
-            elif len(line) > 60 and any(w in line.lower() for w in ['should', 'never', 'always', 'avoid', 'must']):
+            elif len(line) > 60 and _DIRECTIVE_RE.search(line.lower()):
                 candidates.append({'text': line, 'source': source})
 
         # dedupe by text
@@ -270,7 +320,7 @@ class DiscoverExtract:
 
         if out_file:
             Path(out_file).parent.mkdir(parents=True, exist_ok=True)
-            Path(out_file).write_text(json.dumps(out, indent=2))
+            Path(out_file).write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
             logger.info(f"Saved discovery results to {out_file}")
 
         return out
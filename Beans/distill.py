@@ -1,4 +1,4 @@
-import json
+import orjson
 import re
 import logging
 from pathlib import Path
@@ -19,16 +19,16 @@ class Distiller:
         merged = self._merge_sources(unique)
         db = self._build_database(merged)
         Path(self.out).parent.mkdir(parents=True, exist_ok=True)
-        Path(self.out).write_text(json.dumps(db, indent=2))
+        Path(self.out).write_bytes(orjson.dumps(db, option=orjson.OPT_INDENT_2))
         return db
 
     def _load_all(self) -> list:
         rules = []
         for f in self.dir.glob('*.json'):
             try:
-                data = json.loads(f.read_text())
+                data = orjson.loads(f.read_bytes())
                 rules.extend(data.get('rules', []))
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logging.error(f"Failed to parse JSON in {f}: {e}")
             except Exception as e:
                 logging.error(f"Error loading {f}: {e}")
@@ -36,14 +36,29 @@ class Distiller:
 
     def _deduplicate(self, rules: list) -> list:
         unique = []
+        seen_texts = set()
+        # One matcher per kept text with it fixed as seq2, so difflib's index
+        # of that text is built once rather than once per comparison
         seen = []
         for r in rules:
             text = self._normalize(r['rule_text'])
-            if not any(SequenceMatcher(None, text, s).ratio() >= self.sim for s in seen):
-                unique.append(r)
-                seen.append(text)
+            if text in seen_texts or self._is_near_duplicate(text, seen):
+                continue
+            unique.append(r)
+            seen_texts.add(text)
+            seen.append(SequenceMatcher(None, '', text))
         return unique
 
+    def _is_near_duplicate(self, text: str, seen: list) -> bool:
+        for matcher in seen:
+            matcher.set_seq1(text)
+            # real_quick_ratio and quick_ratio are cheap upper bounds on ratio
+            if (matcher.real_quick_ratio() >= self.sim
+                    and matcher.quick_ratio() >= self.sim
+                    and matcher.ratio() >= self.sim):
+                return True
+        return False
+
     def _normalize(self, text: str) -> str:
         text = text.lower()
         text = re.sub(r'[^\w\s]', '', text)
@@ -0,0 +1,77 @@
+"""
+HTTP Session - Shared requests.Session setup for the Beans scrapers
+"""
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_PAGE_BYTES = 8 << 20
+
+
+def make_session(
+    headers: Optional[Dict[str, str]] = None,
+    pool_maxsize: int = 10,
+    retries: int = 3
+) -> requests.Session:
+    """
+    Build a keep-alive session with sized connection pools and retries.
+
+    Retries are handled by urllib3 with exponential backoff and honour
+    Retry-After on 429/503 responses, so callers only see the final
+    response or exception.
+
+    Args:
+        headers: Default headers sent with every request
+        pool_maxsize: Connections kept open per host; should be at least
+            the number of threads sharing the session
+        retries: Retry attempts for connection errors and RETRY_STATUSES
+    """
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=1,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def read_page_text(resp: requests.Response, max_bytes: int = MAX_PAGE_BYTES) -> str:
+    """
+    Read at most max_bytes of a streamed (stream=True) HTML response.
+
+    Responses whose Content-Type is neither HTML nor XML are skipped
+    without reading the body, and oversized pages are truncated rather
+    than buffered in full.
+
+    Args:
+        resp: Response from session.get(..., stream=True)
+        max_bytes: Read cap; the rest of the body is discarded
+    """
+    content_type = resp.headers.get('Content-Type', '').lower()
+    if content_type and 'html' not in content_type and 'xml' not in content_type:
+        return ''
+
+    chunks = []
+    total = 0
+    for chunk in resp.iter_content(65536):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= max_bytes:
+            break
+    body = b''.join(chunks)[:max_bytes]
+    try:
+        return body.decode(resp.encoding or 'utf-8', errors='replace')
+    except LookupError:  # Unknown charset in the Content-Type header
+        return body.decode('utf-8', errors='replace')
@@ -4,13 +4,15 @@ Beans - Fashion Rule Extraction Pipeline
 Commands:
   scrape <urls_file> <output>       Scrape URLs and extract rules
   distill <results_dir> <output>    Deduplicate and merge rules
-  validate <db_file>                Validate rule quality
-  filter <db_file> <output>         Filter out invalid rules
+  validate <db_file> [workers]      Validate rule quality
+  filter <db_file> <output> [workers]
+                                    Filter out invalid rules
   full <urls_file>                  Run full pipeline
 
 Examples:
   python run.py scrape test_urls.txt data/rules.json
   python run.py full test_urls.txt
+  python run.py validate data/rules.json 4   # check rules in 4 worker processes
 """
 
 import sys
@@ -34,10 +36,10 @@ def distill(results_dir: str, output: str):
     print(f"Domains: {stats['unique_domains']} | Multi-source: {stats['multi_source_percentage']:.1f}%")
     return db
 
-def validate(db_file: str):
+def validate(db_file: str, workers: int = None):
     from validate import Validator
     validator = Validator()
-    result = validator.validate(db_file)
+    result = validator.validate(db_file, workers=workers)
     print(f"Validated {result['total']} rules: {result['valid']} valid ({result['pass_rate']})")
     if result['sample_issues']:
         print("Sample issues:")
@@ -45,10 +47,10 @@ def validate(db_file: str):
             print(f"  {issue['text']}... - {issue['error']}")
     return result
 
-def filter_rules(db_file: str, output: str):
+def filter_rules(db_file: str, output: str, workers: int = None):
     from validate import Validator
     validator = Validator()
-    db = validator.filter_invalid(db_file, output)
+    db = validator.filter_invalid(db_file, output, workers)
     print(f"Filtered to {db['statistics']['total_rules']} valid rules")
     print(f"Removed {db['statistics'].get('filtered', 0)} invalid rules")
     return db
@@ -107,10 +109,10 @@ def main():
         scrape(sys.argv[2], sys.argv[3])
     elif cmd == 'distill' and len(sys.argv) == 4:
         distill(sys.argv[2], sys.argv[3])
-    elif cmd == 'validate' and len(sys.argv) == 3:
-        validate(sys.argv[2])
-    elif cmd == 'filter' and len(sys.argv) == 4:
-        filter_rules(sys.argv[2], sys.argv[3])
+    elif cmd == 'validate' and (len(sys.argv) == 3 or len(sys.argv) == 4 and sys.argv[3].isdigit()):
+        validate(sys.argv[2], int(sys.argv[3]) if len(sys.argv) == 4 else None)
+    elif cmd == 'filter' and (len(sys.argv) == 4 or len(sys.argv) == 5 and sys.argv[4].isdigit()):
+        filter_rules(sys.argv[2], sys.argv[3], int(sys.argv[4]) if len(sys.argv) == 5 else None)
     elif cmd == 'full' and len(sys.argv) == 3:
         full_pipeline(sys.argv[2])
     else:
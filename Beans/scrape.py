@@ -1,106 +1,177 @@
 import requests
-import json
+import orjson
 import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from bs4 import BeautifulSoup
 from extract import Extractor
+from http_session import make_session, read_page_text
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 class Scraper:
-    def __init__(self, config_path='config/extraction_rules.json', workers=1):
-        self.cfg = json.loads(Path(config_path).read_text()) if Path(config_path).exists() else {'sites': {}}
+    # Content containers in priority order, mirroring the CSS selectors
+    # article, div[class*=...], .class and main. _find_article ranks every
+    # element against them in one document walk.
+    _DIV_CLASS_SUBSTRINGS = (('article', 1), ('post', 2), ('content', 3), ('main', 4))
+    _CLASS_NAMES = (('article', 5), ('post', 6), ('post-content', 7), ('entry-content', 8))
+    _MAIN_RANK = 9
+    _STRIP_TAGS = ('script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'iframe')
+    _PROMO_SELECTOR = (
+        '[class*="promo"], [class*="sidebar"], [class*="widget"], '
+        '[class*="banner"], [class*="ad"], [class*="newsletter"]'
+    )
+    _TEXT_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li')
+
+    def __init__(self, config_path='config/extraction_rules.json', workers=1, prefetch=8):
+        self.cfg = orjson.loads(Path(config_path).read_bytes()) if Path(config_path).exists() else {'sites': {}}
         self.ext = None  # Lazy load to avoid memory issues
+        # There is no per-host delay here, so fetching stays serial unless the
+        # caller opts in (e.g. for URL lists spread across many sites)
         self.workers = workers
-        self.session = requests.Session()
+        self.prefetch = prefetch
+        # urllib3 negotiates Brotli automatically when `brotli` is installed
+        self.session = make_session({'User-Agent': 'Mozilla/5.0'}, pool_maxsize=max(workers, 10))
 
     def scrape_urls(self, urls: list, output: str) -> dict:
         results = {'rules': [], 'stats': {'success': 0, 'fail': 0}}
 
         # Load model once for all URLs
         if self.ext is None:
-            logging.info("Initializing extractor...")
+            logger.info("Initializing extractor...")
             self.ext = Extractor()
 
-        # Single-threaded to avoid memory issues with MLX model
-        for i, url in enumerate(urls, 1):
-            logging.info(f"Processing {i}/{len(urls)}: {url}")
+        # Pages are fetched by `workers` threads into a bounded queue so
+        # network waits overlap with each other and with extraction; the MLX
+        # model itself stays single-threaded to avoid memory issues.
+        pages = queue.Queue(maxsize=self.prefetch)
+        threading.Thread(target=self._fetch_all, args=(urls, pages), daemon=True).start()
+
+        for i in range(1, len(urls) + 1):
+            url, html = pages.get()
+            # Per-URL detail is debug-level; INFO gets a progress line every 25 pages
+            logger.debug(f"Processing {i}/{len(urls)}: {url}")
             try:
-                rules = self._scrape_url(url)
+                rules = self._extract_rules(url, html) if html else []
                 if rules:
                     results['rules'].extend(rules)
                     results['stats']['success'] += 1
-                    logging.info(f"  ✓ Extracted {len(rules)} rules")
+                    logger.debug(f"  ✓ Extracted {len(rules)} rules")
                 else:
                     results['stats']['fail'] += 1
-                    logging.info(f"  ✗ No rules extracted")
+                    logger.debug(f"  ✗ No rules extracted")
             except Exception as e:
-                logging.error(f"Failed to process {url}: {e}")
+                logger.error(f"Failed to process {url}: {e}")
                 results['stats']['fail'] += 1
+            if i % 25 == 0 or i == len(urls):
+                logger.info(f"Processed {i}/{len(urls)} URLs, {len(results['rules'])} rules so far")
 
         results['stats']['total_rules'] = len(results['rules'])
         Path(output).parent.mkdir(parents=True, exist_ok=True)
-        Path(output).write_text(json.dumps(results, indent=2))
-        logging.info(f"\nResults saved to {output}")
-        logging.info(f"Total: {len(urls)} URLs, {results['stats']['success']} success, {results['stats']['total_rules']} rules")
+        Path(output).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        logger.info(f"\nResults saved to {output}")
+        logger.info(f"Total: {len(urls)} URLs, {results['stats']['success']} success, {results['stats']['total_rules']} rules")
         return results
 
-    def _scrape_url(self, url: str) -> list:
+    def _fetch_all(self, urls: list, pages: queue.Queue):
+        # At most `prefetch` requests are in flight or waiting to be queued,
+        # and pages are handed over in input order.
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = deque()
+            for url in urls:
+                in_flight.append((url, pool.submit(self._fetch, url)))
+                if len(in_flight) >= self.prefetch:
+                    done_url, future = in_flight.popleft()
+                    pages.put((done_url, future.result()))
+            while in_flight:
+                done_url, future = in_flight.popleft()
+                pages.put((done_url, future.result()))
+
+    def _fetch(self, url: str) -> str:
+        try:
+            with self.session.get(url, timeout=10, stream=True) as resp:
+                if resp.status_code != 200:
+                    logger.warning(f"HTTP {resp.status_code} for {url}")
+                    return ''
+                return read_page_text(resp)
+        except requests.RequestException as e:
+            logger.error(f"Request failed for {url}: {e}")
+            return ''
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
+            return ''
+
+    def _extract_rules(self, url: str, html: str) -> list:
         try:
-            resp = self.session.get(url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
-            if resp.status_code != 200:
-                logging.warning(f"HTTP {resp.status_code} for {url}")
-                return []
-            text = self._extract_text(resp.text)
+            text = self._extract_text(html)
             rules = self.ext.extract(text)
             return [{**r, 'sources': [{'url': url, 'domain': self._domain(url)}]} for r in rules]
-        except requests.RequestException as e:
-            logging.error(f"Request failed for {url}: {e}")
-            return []
         except Exception as e:
-            logging.error(f"Error scraping {url}: {e}")
+            logger.error(f"Error scraping {url}: {e}")
             return []
 
     def _extract_text(self, html: str) -> str:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         # First remove all unwanted elements
-        for tag in soup(['script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'iframe']):
+        for tag in soup(self._STRIP_TAGS):
             tag.decompose()
             
         # Try to find the main article content
-        article = None
-        for selector in [
-            'article',
-            'div[class*="article"]',
-            'div[class*="post"]',
-            'div[class*="content"]',
-            'div[class*="main"]',
-            '.article',
-            '.post',
-            '.post-content',
-            '.entry-content',
-            'main'
-        ]:
-            article = soup.select_one(selector)
-            if article:
-                break
-                
+        article = self._find_article(soup)
+
         # If we found an article section, use that, otherwise use the whole body
         content = article if article else soup
         
         # Remove any remaining promotional elements
-        for promo in content.select('[class*="promo"], [class*="sidebar"], [class*="widget"], [class*="banner"], [class*="ad"], [class*="newsletter"]'):
+        for promo in content.select(self._PROMO_SELECTOR):
             promo.decompose()
             
         # Get text content
         lines = []
-        for p in content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li']):
+        for p in content.find_all(self._TEXT_TAGS):
             text = ' '.join(p.stripped_strings)
             if len(text) > 30:  # Only keep substantial lines
                 lines.append(text)
                 
         return ' '.join(lines)
 
+    def _find_article(self, soup):
+        # Equivalent to trying each container selector with select_one in
+        # priority order, but walks the tree once instead of once per selector.
+        best, best_rank = None, self._MAIN_RANK + 1
+        for el in soup.find_all(True):
+            rank = self._container_rank(el, best_rank)
+            if rank < best_rank:
+                best, best_rank = el, rank
+                if rank == 0:
+                    break
+        return best
+
+    def _container_rank(self, el, limit: int) -> int:
+        if el.name == 'article':
+            return 0
+        classes = el.get('class')
+        if classes:
+            if el.name == 'div':
+                joined = ' '.join(classes)
+                for substring, rank in self._DIV_CLASS_SUBSTRINGS:
+                    if rank >= limit:
+                        break
+                    if substring in joined:
+                        return rank
+            for name, rank in self._CLASS_NAMES:
+                if rank >= limit:
+                    break
+                if name in classes:
+                    return rank
+        if el.name == 'main':
+            return self._MAIN_RANK
+        return limit
+
     def _domain(self, url: str) -> str:
         return url.split('/')[2] if len(url.split('/')) > 2 else 'unknown'
\ No newline at end of file
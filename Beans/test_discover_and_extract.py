@@ -0,0 +1,32 @@
+"""Test link discovery on an XHTML seed page (run with pytest from Beans/)."""
+
+import discover_and_extract
+from discover_and_extract import DiscoverExtract
+
+XHTML_SEED = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<body>
+  <a href="/style-guide">Style guide</a>
+  <a href="/tips/café-looks">Café looks</a>
+  <a href="https://elsewhere.example/guide">Off-site guide</a>
+  <a href="/about">About</a>
+</body>
+</html>
+"""
+
+
+def test_discover_urls_from_xhtml_seed(monkeypatch):
+    # Skip loading the embedding model; discovery does not use it
+    monkeypatch.setattr(discover_and_extract, 'SentenceTransformer', None)
+    extractor = DiscoverExtract(max_pages=5, delay=0)
+
+    pages = {'https://shop.example': XHTML_SEED}
+    monkeypatch.setattr(extractor, '_get', lambda url: (200, pages.get(url, '<html></html>')))
+
+    urls = extractor.discover_urls_from_domain('shop.example', keywords=['guide', 'tips'])
+
+    assert urls == [
+        'https://shop.example/style-guide',
+        'https://shop.example/tips/café-looks',
+    ]
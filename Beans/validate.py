@@ -1,85 +1,209 @@
-import json
+import functools
 import re
+from multiprocessing import Pool
 from pathlib import Path
 
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:  # optional: fall back to per-keyword substring scans
+    ahocorasick = None
+
+_REGEX_META = frozenset('\\.^$*+?{}[]|()')
+
 class Validator:
     def __init__(self):
         self.min_w, self.max_w = 5, 30
-        self.advice = {'always', 'never', 'should', 'must', 'avoid', 'best', 'recommend', 'ensure', 'make sure'}
-        self.fashion = {'suit', 'jacket', 'pants', 'shirt', 'shoes', 'tie', 'belt', 'fit', 'style', 'wear', 'dress', 'color', 'collar', 'sleeve'}
-        self.skip = [
+        # Canonical keyword and pattern definitions; the compiled matchers are derived
+        # from these and rebuilt whenever they change (see _ensure_compiled)
+        self.advice = frozenset({'always', 'never', 'should', 'must', 'avoid', 'best', 'recommend', 'ensure', 'make sure'})
+        self.fashion = frozenset({'suit', 'jacket', 'pants', 'shirt', 'shoes', 'tie', 'belt', 'fit', 'style', 'wear', 'dress', 'color', 'collar', 'sleeve'})
+        self.skip = (
             r'\$\d+', r'shop\s+', r'buy\s+', r'click', r'subscribe',
             r'question #\d+:', r'how to', r"i've", r"i'm", r'in this article',
             r'article title', r'\?$', r'what should you', r'which style'
-        ]
-
-    def validate(self, db_path: str) -> dict:
-        data = json.loads(Path(db_path).read_text())
+        )
+        self._compile()
+
+    def _settings(self) -> tuple:
+        return self.min_w, self.max_w, frozenset(self.advice), frozenset(self.fashion), tuple(self.skip)
+
+    def _compile(self):
+        """Derive the compiled matchers and the cached checker from the current settings."""
+        self._compiled_for = self._settings()
+        # Plain phrases are checked with substring tests; only real patterns go through re.
+        # Everything runs against the lowercased text, so no re.I is needed.
+        self._skip_literals = tuple(p for p in self.skip if not _REGEX_META.intersection(p))
+        self._skip_union = re.compile(
+            '|'.join(f'(?:{p})' for p in self.skip if _REGEX_META.intersection(p))
+        )
+        self._keywords = self._build_keyword_automaton()
+        # Without pyahocorasick, one literal alternation per category still scans the text once
+        self._advice_re = re.compile('|'.join(map(re.escape, sorted(self.advice))))
+        self._fashion_re = re.compile('|'.join(map(re.escape, sorted(self.fashion))))
+        # Scraped rule databases repeat a lot of text; the result depends only on
+        # the text and its word count, so duplicates skip the scans entirely
+        self._check_text = functools.lru_cache(maxsize=200_000)(self._make_checker())
+
+    def _ensure_compiled(self):
+        # Settings adjusted after construction (e.g. min_w/max_w) take effect on the next run
+        if self._compiled_for != self._settings():
+            self._compile()
+
+    # Pool workers receive the instance itself, so subclasses and adjusted settings are
+    # checked the same way as in-process. The automaton and the cached closure cannot
+    # be pickled; they are rebuilt on the worker side instead.
+    _DERIVED = ('_compiled_for', '_skip_literals', '_skip_union', '_keywords', '_advice_re', '_fashion_re', '_check_text')
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in self._DERIVED}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def _build_keyword_automaton(self):
+        """One automaton tagging advice words with bit 1 and fashion words with bit 2."""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for word in self.advice | self.fashion:
+            automaton.add_word(word, (word in self.advice) | (word in self.fashion) << 1)
+        automaton.make_automaton()
+        return automaton
+
+    def validate(self, db_path: str, workers: int = None) -> dict:
+        return self.validate_and_filter(db_path, workers=workers)['report']
+
+    def filter_invalid(self, db_path: str, output: str, workers: int = None) -> dict:
+        return self.validate_and_filter(db_path, output, workers)['data']
+
+    def validate_and_filter(self, db_path: str, output: str = None, workers: int = None) -> dict:
+        """Check every rule once and return both the report and the filtered database.
+
+        The filtered database is written to `output` when one is given.
+        """
+        data = orjson.loads(Path(db_path).read_bytes())
         rules = data.get('rules', [])
-
-        valid, invalid = 0, 0
-        issues = []
-
-        for r in rules:
-            ok, err = self._check(r)
-            if ok:
-                valid += 1
-            else:
-                invalid += 1
-                if len(issues) < 10:
-                    issues.append({'text': r.get('rule_text', '')[:60], 'error': err})
-
-        return {
+        self._ensure_compiled()
+
+        if workers and workers > 1 and len(rules) > workers:
+            size = -(-len(rules) // workers)
+            chunks = [rules[i:i + size] for i in range(0, len(rules), size)]
+            with Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+                results = pool.map(_check_batch, chunks)
+        else:
+            results = [self._mask(rules)]
+
+        # Workers return compact masks rather than pickled rule lists
+        mask = bytearray().join(res[0] for res in results)
+        issues = [issue for res in results for issue in res[1]][:10]
+        valid_rules = [r for r, ok in zip(rules, mask) if ok]
+        valid = len(valid_rules)
+        invalid = len(rules) - valid
+
+        report = {
             'total': len(rules),
             'valid': valid,
             'invalid': invalid,
             'pass_rate': f"{valid/len(rules)*100:.1f}%" if rules else "0%",
-            'sample_issues': issues
+            'sample_issues': [{'text': t, 'error': e} for t, e in issues]
         }
 
-    def _check(self, rule: dict) -> tuple:
-        text = rule.get('rule_text', '')
-
-        if not text or not text[0].isupper():
-            return False, 'No capital start'
+        data['rules'] = valid_rules
+        if 'statistics' in data:
+            data['statistics']['total_rules'] = valid
+            data['statistics']['filtered'] = len(rules) - valid
 
-        if not text[-1] in '.!':
-            return False, 'No punctuation'
+        if output:
+            Path(output).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return {'report': report, 'data': data}
 
-        if '?' in text:
-            return False, 'Contains question'
+    def _mask(self, rules: list) -> tuple:
+        """Return (validity bytearray, first_10_issues) for a batch of rules."""
+        mask = bytearray(len(rules))
+        issues = []
 
-        wc = rule.get('word_count', len(text.split()))
-        if wc < self.min_w:
-            return False, f'Too short ({wc} words)'
-        if wc > self.max_w:
-            return False, f'Too long ({wc} words)'
+        check = self._check
+        for i, r in enumerate(rules):
+            ok, err = check(r)
+            if ok:
+                mask[i] = 1
+            elif len(issues) < 10:
+                issues.append((r.get('rule_text', '')[:60], err))
 
-        if any(re.search(p, text, re.I) for p in self.skip):
-            return False, 'Prohibited content'
+        return mask, issues
 
-        low = text.lower()
-        if not any(a in low for a in self.advice):
-            return False, 'No advice indicator'
-        if not any(f in low for f in self.fashion):
-            return False, 'No fashion terms'
+    def _check(self, rule: dict) -> tuple:
+        return self._check_text(rule.get('rule_text', ''), rule.get('word_count'))
+
+    def _make_checker(self):
+        """Build the per-text check as a closure with this instance's settings bound as locals."""
+        min_w, max_w = self.min_w, self.max_w
+        keywords = self._keywords
+        advice_search, fashion_search = self._advice_re.search, self._fashion_re.search
+        skip_literals, skip_search = self._skip_literals, self._skip_union.search
+
+        def check(text: str, wc) -> tuple:
+            # Plain character comparisons avoid a method lookup per rule
+            if not text or not ('A' <= text[0] <= 'Z'):
+                return False, 'No capital start'
+
+            last = text[-1]
+            if last != '.' and last != '!':
+                return False, 'No punctuation'
+
+            if '?' in text:
+                return False, 'Contains question'
+
+            words = None
+            if wc is None:
+                words = text.split()
+                wc = len(words)
+            if wc < min_w:
+                return False, f'Too short ({wc} words)'
+            if wc > max_w:
+                return False, f'Too long ({wc} words)'
+
+            if words is None:
+                words = text.split()
+            capital_words = sum(1 for word in words if word[0].isupper())
+            if capital_words > wc * 0.4:
+                return False, 'Too many capitals (article title)'
+
+            # Keyword scans only run for rules that passed the cheap checks, and the
+            # prohibited-content regex only for rules that look like relevant advice
+            low = text.lower()
+            if keywords is not None:
+                hits = 0
+                for _, tag in keywords.iter(low):
+                    hits |= tag
+                    if hits == 3:
+                        break
+                if not hits & 1:
+                    return False, 'No advice indicator'
+                if not hits & 2:
+                    return False, 'No fashion terms'
+            else:
+                if not advice_search(low):
+                    return False, 'No advice indicator'
+                if not fashion_search(low):
+                    return False, 'No fashion terms'
 
-        capital_words = sum(1 for word in text.split() if word and word[0].isupper())
-        if capital_words > wc * 0.4:
-            return False, 'Too many capitals (article title)'
+            if any(lit in low for lit in skip_literals) or skip_search(low):
+                return False, 'Prohibited content'
 
-        return True, None
+            return True, None
 
-    def filter_invalid(self, db_path: str, output: str) -> dict:
-        data = json.loads(Path(db_path).read_text())
-        rules = data.get('rules', [])
+        return check
 
-        valid_rules = [r for r in rules if self._check(r)[0]]
+_VALIDATOR = None
 
-        data['rules'] = valid_rules
-        if 'statistics' in data:
-            data['statistics']['total_rules'] = len(valid_rules)
-            data['statistics']['filtered'] = len(rules) - len(valid_rules)
+def _init_worker(validator: Validator):
+    # Each pool process unpickles the caller's validator once, recompiling its patterns
+    global _VALIDATOR
+    _VALIDATOR = validator
 
-        Path(output).write_text(json.dumps(data, indent=2))
-        return data
\ No newline at end of file
+def _check_batch(rules: list) -> tuple:
+    return _VALIDATOR._mask(rules)
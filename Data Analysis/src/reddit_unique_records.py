@@ -7,6 +7,11 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 DATA_DIR = PROJECT_ROOT / "data"
@@ -39,8 +44,8 @@ def parse_args() -> argparse.Namespace:
 
 
 def load_data(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    raw = path.read_bytes()
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
 
 def comment_key(comment: Dict[str, Any]) -> Tuple[str, str]:
@@ -161,6 +166,9 @@ def flatten_posts(
 
 
 def write_output(path: Path, records: List[Dict[str, Any]]) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+        return
     with path.open("w", encoding="utf-8") as handle:
         json.dump(records, handle, ensure_ascii=False, indent=2)
 
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import operator
+import os
 import re
-from collections import Counter, defaultdict
+from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path, PurePath
-from typing import Iterable, List, Mapping, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 
 # The following try/except blocks guard against missing optional dependencies.
 try:
@@ -14,6 +18,12 @@ except ImportError:  # pragma: no cover
     SpellChecker = None  # type: ignore
     "Type alias for optional dependency."
 
+try:
+    from symspellpy import SymSpell, Verbosity
+except ImportError:  # pragma: no cover
+    SymSpell = None  # type: ignore
+    Verbosity = None  # type: ignore
+
 try:
     import language_tool_python
 except ImportError:  # pragma: no cover
@@ -27,15 +37,46 @@ except ImportError:  # pragma: no cover
     "Type alias for optional dependency."
 
 try:
-    from sklearn.cluster import KMeans
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.decomposition import PCA
     from numpy.typing import NDArray
     from sklearn.metrics import silhouette_score
 except ImportError:  # pragma: no cover
-    KMeans = None  # type: ignore
+    MiniBatchKMeans = None  # type: ignore
+    PCA = None  # type: ignore
     silhouette_score = None  # type: ignore
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+try:
+    from joblib import Parallel, delayed
+except ImportError:  # pragma: no cover
+    Parallel = None  # type: ignore
+    delayed = None  # type: ignore
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[A-Za-z]+|[^A-Za-z]+")
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_SCORE_KEY = operator.itemgetter("score")
+_LT_SENTINEL = "\n\n§§§\n\n"
+_LT_SENTINEL_RE = re.compile(r"\s*§§§\s*")
 
 
 @dataclass
@@ -43,13 +84,25 @@ class PipelineConfig:
     input_path: PurePath = DATA_DIR / "reddit_fashion_data_unique.json"
     output_path: Path = DATA_DIR / "semantic_engine_evaluation.json"
     model_name: str = "sentence-transformers/all-mpnet-base-v2"
+    device: Optional[str] = None  # e.g. "cuda" or "mps"; None lets sentence-transformers pick
+    # "torch", "onnx" or "onnx-int8"; the ONNX backends need sentence-transformers[onnx]>=3.2
+    backend: str = "torch"
+    onnx_cache_dir: Path = DATA_DIR / "onnx_models"
+    half_precision: bool = True  # Run the torch backend in fp16 when it lands on cuda or mps
+    # Cleaned corpora and embeddings are reused from here when inputs and options match
+    cache_dir: Optional[Path] = DATA_DIR / "pipeline_cache"
     batch_size: int = 64
     min_k: int = 6
     max_k: int = 18
     samples_per_cluster: int = 5
+    pca_components: int = 64  # Embeddings are projected to this many dims before clustering
+    silhouette_sample_size: int = 5000
     use_spellcheck: bool = False  # Set to True to enable spell-checking (very slow!)
+    # "pyspellchecker" or "symspell"; SymSpell's precomputed deletes make lookups far cheaper
+    spell_backend: str = "pyspellchecker"
     use_language_tool: bool = False
-    skip_spellcheck: Sequence[str] = field(
+    n_jobs: int = -1  # Worker processes for text cleaning; 1 runs serially
+    skip_spellcheck: Iterable[str] = field(
         default_factory=lambda: [
             "reddit",
             "malefashionadvice",
@@ -67,6 +120,10 @@ class PipelineConfig:
         ]
     )
 
+    def __post_init__(self) -> None:
+        # Normalize once so every consumer can use the words as a lowercase lookup.
+        self.skip_spellcheck = frozenset(word.lower() for word in self.skip_spellcheck)
+
 
 def ensure_module(name: str, module: Optional[object], install_hint: str) -> None:
     """Raise a RuntimeError if an optional dependency is not installed."""
@@ -78,7 +135,7 @@ def ensure_module(name: str, module: Optional[object], install_hint: str) -> Non
 
 def normalize_whitespace(text: str) -> str:
     """Collapse multiple whitespace characters into a single space."""
-    return re.sub(r"\s+", " ", text).strip()
+    return _WS_RE.sub(" ", text).strip()
 
 
 def preserve_case(original: str, correction: str) -> str:
@@ -90,7 +147,7 @@ def preserve_case(original: str, correction: str) -> str:
     return correction
 
 
-def build_spellchecker(skip_words: Sequence[str]) -> "SpellChecker":
+def build_spellchecker(skip_words: Iterable[str]) -> "SpellChecker":
     """Initialize the spellchecker with domain-specific words."""
     ensure_module("spellchecker", SpellChecker, "pip install pyspellchecker")
     checker: "SpellChecker" = SpellChecker(language="en")
@@ -98,47 +155,69 @@ def build_spellchecker(skip_words: Sequence[str]) -> "SpellChecker":
     return checker
 
 
-def correct_spelling(
-    text: str, checker: "SpellChecker", skip_words: Sequence[str]
-) -> str:
-    """Correct spelling in a string while preserving case and skipping domain words."""
-    skip_lookup = {w.lower() for w in skip_words}
-    tokens = re.findall(r"[A-Za-z]+|[^A-Za-z]+", text)
-    corrected: List[str] = []
+def build_symspell(skip_words: Iterable[str]) -> "SymSpell":
+    """Initialize SymSpell with its bundled English frequency list and domain words."""
+    ensure_module("symspellpy", SymSpell, "pip install symspellpy")
+    from importlib.resources import files
 
-    # Batch collect all alpha tokens to check at once for better performance
-    alpha_tokens = [token for token in tokens if token.isalpha()]
-    alpha_lower = [t.lower() for t in alpha_tokens]
+    checker: "SymSpell" = SymSpell(max_dictionary_edit_distance=2, prefix_length=7)
+    checker.load_dictionary(
+        str(files("symspellpy") / "frequency_dictionary_en_82_765.txt"),
+        term_index=0,
+        count_index=1,
+    )
+    for word in skip_words:
+        checker.create_dictionary_entry(word.lower(), 10**9)
+    return checker
 
-    # Filter out tokens we want to skip (domain words, short words)
-    tokens_to_check = [
-        lower for lower in alpha_lower
-        if lower not in skip_lookup and len(lower) > 2
-    ]
 
-    # Batch check all unknown words at once
-    unknown_set = set(checker.unknown(tokens_to_check)) if tokens_to_check else set()
+def precompute_corrections(
+    all_texts: Iterable[str],
+    checker: "SpellChecker | SymSpell",
+    skip_words: Iterable[str],
+) -> Dict[str, str]:
+    """Map every misspelled word in the corpus to its correction.
+
+    Each unique unknown word is corrected once, however many posts it
+    appears in.
+    """
+    skip_lookup = (
+        skip_words
+        if isinstance(skip_words, frozenset)
+        else frozenset(w.lower() for w in skip_words)
+    )
+    unique = {
+        lower
+        for text in all_texts
+        for lower in (token.lower() for token in _TOKEN_RE.findall(text))
+        if lower.isalpha() and len(lower) > 2 and lower not in skip_lookup
+    }
+    if not unique:
+        return {}
+
+    corrections: Dict[str, str] = {}
+    if SymSpell is not None and isinstance(checker, SymSpell):
+        for word in unique:
+            suggestions = checker.lookup(word, Verbosity.TOP, max_edit_distance=2)
+            if suggestions and suggestions[0].distance > 0:
+                corrections[word] = suggestions[0].term
+        return corrections
+
+    for word in checker.unknown(unique):
+        best = checker.correction(word)
+        if best and best != word:
+            corrections[word] = best
+    return corrections
+
+
+def correct_spelling(text: str, corrections: Mapping[str, str]) -> str:
+    """Rewrite misspelled words from a precomputed correction map, preserving case."""
+    tokens = _TOKEN_RE.findall(text)
+    corrected: List[str] = []
 
     for token in tokens:
-        if not token.isalpha():
-            corrected.append(token)
-            continue
-
-        lower = token.lower()
-        if lower in skip_lookup or len(lower) <= 2:
-            corrected.append(token)
-            continue
-
-        # Use pre-computed unknown set instead of checking each word individually
-        if lower not in unknown_set:
-            corrected.append(token)
-            continue
-
-        best = checker.correction(lower)
-        if best and best != lower:
-            corrected.append(preserve_case(token, best))
-        else:
-            corrected.append(token)
+        best = corrections.get(token.lower())
+        corrected.append(preserve_case(token, best) if best else token)
 
     return "".join(corrected)
 
@@ -148,7 +227,7 @@ def sentence_case(text: str) -> str:
     if not text:
         return text
 
-    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+    sentences = _SENT_SPLIT_RE.split(text.strip())
     formatted: List[str] = []
 
     for sentence in sentences:
@@ -174,16 +253,48 @@ def apply_language_tool(text: str, tool: "language_tool_python.LanguageTool") ->
     return tool.correct(text)
 
 
-def load_posts(path: Path) -> List[tuple[str, Mapping[str, object]]]:
-    """Load posts from a JSON file into a list of (category, post_data) tuples."""
-    with path.open("r", encoding="utf-8") as file_handle:
-        data = json.load(file_handle)
+def apply_language_tool_batched(
+    texts: Sequence[str],
+    tool: "language_tool_python.LanguageTool",
+    batch_size: int = 50,
+) -> List[str]:
+    """Correct texts in batches, one LanguageTool request per batch.
 
-    posts: List[tuple[str, Mapping[str, object]]] = []
-    for category, items in data.items():  # Assumes JSON structure is {category: [posts]}
-        if isinstance(items, list):
-            posts.extend((category, post) for post in items if isinstance(post, dict))
-    return posts
+    Texts are joined with a paragraph-separated sentinel and split back
+    afterwards. A batch whose sentinels do not survive intact is redone
+    one text at a time.
+    """
+    corrected: List[str] = []
+    total = len(texts)
+    for start in range(0, total, batch_size):
+        if start % 500 < batch_size:
+            print(f"  Grammar check {start + 1}/{total} ({(start + 1)/total*100:.1f}%)...")
+        batch = texts[start : start + batch_size]
+        pieces = _LT_SENTINEL_RE.split(tool.correct(_LT_SENTINEL.join(batch)).strip())
+        if len(pieces) != len(batch):
+            pieces = [apply_language_tool(text, tool) for text in batch]
+        corrected.extend(pieces)
+    return corrected
+
+
+def load_posts(path: Path) -> Iterator[tuple[str, Mapping[str, object]]]:
+    """Yield (category, post_data) tuples from a {category: [posts]} JSON file.
+
+    With ijson installed the file is streamed, so posts reach the cleaning
+    step without the whole scrape being held in memory first.
+    """
+    with path.open("rb") as file_handle:
+        if ijson is not None:
+            groups = ijson.kvitems(file_handle, "", use_float=True)
+        else:
+            raw = file_handle.read()
+            groups = (orjson.loads(raw) if orjson else json.loads(raw)).items()
+
+        for category, items in groups:
+            if isinstance(items, list):
+                for post in items:
+                    if isinstance(post, dict):
+                        yield category, post
 
 
 def extract_top_comment(post: Mapping[str, object]) -> str:
@@ -192,30 +303,63 @@ def extract_top_comment(post: Mapping[str, object]) -> str:
     if not isinstance(comments, list) or not comments:
         return ""
 
-    top = max(
-        comments,
-        key=lambda comment: comment.get("score", 0) if isinstance(comment, dict) else 0,
-    )
+    try:
+        # Scraped comments are dicts that always carry a score.
+        top = max(comments, key=_SCORE_KEY)
+    except (KeyError, TypeError):
+        top = max(
+            comments,
+            key=lambda comment: comment.get("score", 0) if isinstance(comment, dict) else 0,
+        )
     if isinstance(top, dict):
         return str(top.get("body", "")).strip()
     return ""
 
 
+def _clean_one(text: str, corrections: Mapping[str, str]) -> str:
+    """Apply spelling corrections and sentence casing to one normalized text."""
+    if corrections:
+        text = correct_spelling(text, corrections)
+    return sentence_case(text)
+
+
+def _clean_batch(texts: Sequence[str], corrections: Mapping[str, str]) -> List[str]:
+    return [_clean_one(text, corrections) for text in texts]
+
+
+def clean_texts(
+    texts: Sequence[str], corrections: Mapping[str, str], n_jobs: int
+) -> List[str]:
+    """Clean texts, fanning out over worker processes when joblib is available.
+
+    Texts are split into one chunk per worker so the corrections map is
+    pickled once per worker rather than once per post.
+    """
+    # Small corpora finish before a process pool would even start up.
+    if Parallel is None or n_jobs == 1 or len(texts) < 1000:
+        return _clean_batch(texts, corrections)
+
+    workers = (os.cpu_count() or 1) if n_jobs < 0 else n_jobs
+    size = -(-len(texts) // workers)
+    chunks = [texts[i : i + size] for i in range(0, len(texts), size)]
+    results = Parallel(n_jobs=len(chunks), backend="loky")(
+        delayed(_clean_batch)(chunk, corrections) for chunk in chunks
+    )
+    return [text for chunk in results for text in chunk]
+
+
 def prepare_corpus(
     posts: Iterable[tuple[str, Mapping[str, object]]],
-    checker: Optional[SpellChecker],
-    skip_words: Sequence[str],
+    checker: "Optional[SpellChecker | SymSpell]",
+    skip_words: Iterable[str],
     grammar_tool: Optional["language_tool_python.LanguageTool"],
+    n_jobs: int = 1,
 ) -> List[Mapping[str, str]]:
     """Clean and prepare text from posts for embedding."""
     corpus: List[Mapping[str, str]] = []
-    posts_list = list(posts)
-    total = len(posts_list)
-
-    for idx, (category, post) in enumerate(posts_list, 1):
-        if idx % 500 == 0 or idx == 1:
-            print(f"  Processing post {idx}/{total} ({idx/total*100:.1f}%)...")
+    entries: List[tuple[str, Mapping[str, object], str, str]] = []
 
+    for category, post in posts:
         title = str(post.get("title", "")).strip()
         selftext = str(post.get("selftext", "")).strip()
         top_comment = extract_top_comment(post)
@@ -223,16 +367,26 @@ def prepare_corpus(
         combined = normalize_whitespace(
             " ".join(filter(None, [title, selftext, top_comment]))
         )
-        if not combined:
-            continue
+        if combined:
+            entries.append((category, post, title, combined))
+
+    corrections: Dict[str, str] = {}
+    if checker:
+        print("  Building spelling corrections for the corpus...")
+        corrections = precompute_corrections(
+            (entry[3] for entry in entries), checker, skip_words
+        )
 
-        cleaned = combined
-        if checker:
-            cleaned = correct_spelling(cleaned, checker, skip_words)
-        cleaned = sentence_case(cleaned)
-        if grammar_tool:
-            cleaned = apply_language_tool(cleaned, grammar_tool)
+    total = len(entries)
+    print(f"  Cleaning {total} posts...")
+    cleaned_texts = clean_texts([entry[3] for entry in entries], corrections, n_jobs)
 
+    # LanguageTool talks to a single local server, so grammar stays serial.
+    # It runs after sentence_case so the batch sentinels are never recased.
+    if grammar_tool:
+        cleaned_texts = apply_language_tool_batched(cleaned_texts, grammar_tool)
+
+    for (category, post, title, _), cleaned in zip(entries, cleaned_texts):
         corpus.append(
             {
                 "post_id": str(post.get("post_id", "")),
@@ -245,36 +399,96 @@ def prepare_corpus(
     return corpus
 
 
-def embed_texts(texts: Sequence[str], config: PipelineConfig) -> NDArray:
-    """Encodes a sequence of texts into sentence embeddings."""
+@functools.lru_cache(maxsize=4)
+def load_embedding_model(
+    model_name: str,
+    device: Optional[str],
+    backend: str,
+    onnx_cache_dir: Path,
+    half_precision: bool = False,
+) -> "SentenceTransformer":
+    """Load the embedding model on the requested backend.
+
+    Models are cached per process, so repeated pipeline runs (e.g. a sweep
+    over k ranges) only pay the load once. "onnx-int8" exports a dynamically
+    quantized copy of the model to `onnx_cache_dir` on first use and reuses
+    it afterwards. `half_precision` casts torch models placed on a GPU to fp16.
+    """
     ensure_module(
         "sentence-transformers",
         SentenceTransformer,
         "pip install sentence-transformers",
     )
-    model = SentenceTransformer(config.model_name)
-    return model.encode(
+    if backend == "torch":
+        import torch
+
+        torch.set_num_threads(os.cpu_count() or 4)
+        model = SentenceTransformer(model_name, device=device)
+        if half_precision and model.device.type in ("cuda", "mps"):
+            model.half()
+        return model
+    if backend == "onnx":
+        return SentenceTransformer(model_name, device=device, backend="onnx")
+    if backend == "onnx-int8":
+        quantized_dir = onnx_cache_dir / model_name.replace("/", "__")
+        if not (quantized_dir / ONNX_INT8_FILE).exists():
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+
+            onnx_model = SentenceTransformer(model_name, backend="onnx")
+            onnx_model.save(str(quantized_dir))
+            export_dynamic_quantized_onnx_model(onnx_model, "avx512_vnni", str(quantized_dir))
+        return SentenceTransformer(
+            str(quantized_dir),
+            device=device,
+            backend="onnx",
+            model_kwargs={"file_name": ONNX_INT8_FILE},
+        )
+    raise ValueError(f"Unknown embedding backend '{backend}'")
+
+
+def embed_texts(texts: Sequence[str], config: PipelineConfig) -> NDArray:
+    """Encodes a sequence of texts into sentence embeddings."""
+    model = load_embedding_model(
+        config.model_name,
+        config.device,
+        config.backend,
+        config.onnx_cache_dir,
+        config.half_precision,
+    )
+    # encode() already length-sorts its input into batches (smart batching)
+    # and restores the original order, so texts are passed through as-is.
+    embeddings = model.encode(
         texts,
         batch_size=config.batch_size,
         show_progress_bar=True,
         normalize_embeddings=True,
+        convert_to_numpy=True,
     )
+    # fp16 models return fp16 arrays; clustering and the cache expect fp32.
+    return embeddings.astype(np.float32, copy=False)
 
 
 def evaluate_clusters(embeddings: NDArray, config: PipelineConfig):
-    """Perform K-Means clustering and evaluate results using silhouette scores."""
-    ensure_module("scikit-learn", KMeans, "pip install scikit-learn")
+    """Cluster a PCA projection of the embeddings for each k and score it by silhouette."""
+    ensure_module("scikit-learn", MiniBatchKMeans, "pip install scikit-learn")
     ensure_module("scikit-learn", silhouette_score, "pip install scikit-learn")
 
+    n_components = min(config.pca_components, *embeddings.shape)
+    reduced = PCA(n_components=n_components, random_state=42).fit_transform(embeddings)
+    sample_size = min(config.silhouette_sample_size, len(reduced))
+
     scores = []
     for k in range(config.min_k, config.max_k + 1):
-        model = KMeans(
+        model = MiniBatchKMeans(
             n_clusters=k,
             random_state=42,
-            n_init="auto",
+            n_init=3,
+            batch_size=4096,
+        )
+        labels = model.fit_predict(reduced)
+        score = float(
+            silhouette_score(reduced, labels, sample_size=sample_size, random_state=42)
         )
-        labels = model.fit_predict(embeddings)
-        score = float(silhouette_score(embeddings, labels))
         scores.append(
             {
                 "k": k,
@@ -294,40 +508,36 @@ def summarize_clusters(
     samples_per_cluster: int,
 ) -> List[Mapping[str, object]]:
     """Generate a summary for each cluster with top categories and text examples."""
-    clusters_data: Mapping[int, Mapping[str, object]] = defaultdict(
-        lambda: {"category_counts": Counter(), "examples": []}
-    )
-
-    for record, label in zip(corpus, labels):
-        cluster_payload = clusters_data[label]
-        category = record.get("category", "")
-        if category:
-            cluster_payload["category_counts"][category] += 1  # type: ignore[index]
-
-        examples: List[Mapping[str, str]] = cluster_payload["examples"]  # type: ignore[assignment]
-        if len(examples) < samples_per_cluster:
-            examples.append(
-                {
-                    "post_id": record.get("post_id", ""),
-                    "excerpt": record.get("clean_text", "")[:320],
-                }
-            )
+    labels = np.asarray(labels)
+    if not len(labels):
+        return []
+    # A stable sort groups posts by cluster while keeping corpus order within each group.
+    order = np.argsort(labels, kind="stable")
+    sorted_labels = labels[order]
+    boundaries = np.flatnonzero(np.diff(sorted_labels)) + 1
+    categories = [record.get("category", "") for record in corpus]
 
     summary = []
-    for label, payload in clusters_data.items():
-        counts = payload["category_counts"].most_common(5)  # type: ignore[index]
+    for members in np.split(order, boundaries):
+        counts = Counter(map(categories.__getitem__, members.tolist()))
+        counts.pop("", None)
         summary.append(
             {
-                "cluster": int(label),
+                "cluster": int(labels[members[0]]),
                 "top_categories": [
                     {"category": category, "count": count}
-                    for category, count in counts
+                    for category, count in counts.most_common(5)
+                ],
+                "examples": [
+                    {
+                        "post_id": corpus[idx].get("post_id", ""),
+                        "excerpt": corpus[idx].get("clean_text", "")[:320],
+                    }
+                    for idx in members[:samples_per_cluster].tolist()
                 ],
-                "examples": payload["examples"],  # type: ignore[index]
             }
         )
 
-    summary.sort(key=lambda item: item["cluster"])
     return summary
 
 
@@ -348,20 +558,61 @@ def serialize_scores(scores, summary, config: PipelineConfig) -> Mapping[str, ob
 def write_results(payload: Mapping[str, object], config: PipelineConfig) -> None:
     """Write the final evaluation payload to a JSON file."""
     config.output_path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        config.output_path.write_bytes(
+            orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+        return
     with config.output_path.open("w", encoding="utf-8") as file_handle:
         json.dump(payload, file_handle, indent=2)
 
 
-def run_pipeline(config: PipelineConfig) -> None:
-    """Execute the full semantic analysis pipeline."""
+def cache_key(*parts: object) -> str:
+    """Hash the inputs that determine a cached artifact into a short file stem."""
+    return hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:16]
+
+
+def corpus_cache_key(config: PipelineConfig) -> str:
+    """Key the cleaned corpus on the input file and every cleaning option."""
+    stat = Path(config.input_path).stat()
+    return cache_key(
+        config.input_path,
+        stat.st_mtime_ns,
+        stat.st_size,
+        config.use_spellcheck,
+        config.spell_backend if config.use_spellcheck else "",
+        sorted(config.skip_spellcheck) if config.use_spellcheck else "",
+        config.use_language_tool,
+    )
+
+
+def load_cached_corpus(path: Path) -> Optional[List[Mapping[str, str]]]:
+    """Return a previously cleaned corpus, or None when it is missing or unreadable."""
+    try:
+        raw = path.read_bytes()
+        return orjson.loads(raw) if orjson else json.loads(raw)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_corpus(path: Path, corpus: Sequence[Mapping[str, str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(corpus) if orjson else json.dumps(corpus).encode("utf-8"))
+
+
+def build_corpus(config: PipelineConfig) -> List[Mapping[str, str]]:
+    """Load posts and clean them according to the pipeline configuration."""
     print(f"Loading posts from {config.input_path}...")
     posts = load_posts(config.input_path)
-    print(f"Loaded {len(posts)} posts")
 
     checker = None
     if config.use_spellcheck:
-        print("Building spellchecker (note: this makes processing MUCH slower)...")
-        checker = build_spellchecker(config.skip_spellcheck)
+        if config.spell_backend == "symspell":
+            print("Building SymSpell dictionary...")
+            checker = build_symspell(config.skip_spellcheck)
+        else:
+            print("Building spellchecker (note: this makes processing MUCH slower)...")
+            checker = build_spellchecker(config.skip_spellcheck)
     else:
         print("Spell-checking disabled for faster processing")
 
@@ -375,12 +626,47 @@ def run_pipeline(config: PipelineConfig) -> None:
         tool = language_tool_python.LanguageTool("en-US")
 
     print("Cleaning and normalizing text...")
-    corpus = prepare_corpus(posts, checker, config.skip_spellcheck, tool)
+    return prepare_corpus(posts, checker, config.skip_spellcheck, tool, config.n_jobs)
+
+
+def run_pipeline(config: PipelineConfig) -> None:
+    """Execute the full semantic analysis pipeline.
+
+    With `cache_dir` set, the cleaned corpus and its embeddings are written
+    there and reused on later runs with the same input and options, so only
+    clustering is repeated when e.g. the k range changes.
+    """
+    corpus_key = corpus_cache_key(config) if config.cache_dir else None
+    corpus = None
+    if corpus_key:
+        corpus_path = config.cache_dir / f"corpus_{corpus_key}.json"
+        corpus = load_cached_corpus(corpus_path)
+        if corpus is not None:
+            print(f"Reusing cleaned corpus from {corpus_path}")
+    if corpus is None:
+        corpus = build_corpus(config)
+        if corpus_key:
+            save_cached_corpus(corpus_path, corpus)
     texts = [record["clean_text"] for record in corpus]
     print(f"Prepared {len(texts)} cleaned texts")
 
-    print(f"Embedding texts with {config.model_name}...")
-    embeddings = embed_texts(texts, config)
+    embeddings = None
+    if corpus_key:
+        embeddings_key = cache_key(
+            corpus_key,
+            config.model_name,
+            config.backend,
+            config.half_precision and config.backend == "torch",
+        )
+        embeddings_path = config.cache_dir / f"embeddings_{embeddings_key}.npy"
+        if embeddings_path.exists():
+            print(f"Reusing embeddings from {embeddings_path}")
+            embeddings = np.load(embeddings_path, allow_pickle=False)
+    if embeddings is None:
+        print(f"Embedding texts with {config.model_name}...")
+        embeddings = embed_texts(texts, config)
+        if corpus_key:
+            np.save(embeddings_path, embeddings, allow_pickle=False)
 
     print("Evaluating semantic cohesion across cluster counts...")
     scores = evaluate_clusters(embeddings, config)
@@ -1,11 +1,27 @@
-import argparse, json, os, sys, time, hashlib
+import argparse, json, os, sys, time, hashlib, heapq
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Literal, Optional, Dict
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Literal, Optional, Dict, Tuple
 
 # libs
 import ollama  # pip install -U ollama
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
+try:  # optional: stream large inputs instead of loading them whole
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:  # optional: faster JSONL parsing
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Streamed input can turn out malformed only after some posts were already processed
+INPUT_STREAM_ERRORS = (ijson.JSONError,) if ijson is not None else ()
+
 class AppConfig:
     # Default runtime settings for the application.
     DEFAULT_MODEL: str = os.getenv("MODEL", "qwen2.5:1.5b-instruct")
@@ -14,6 +30,8 @@ class AppConfig:
     MAX_POSTS: int = int(os.getenv("MAX_POSTS", "0"))  # 0 = no limit
     MAX_CHARS_PER_POST: int = int(os.getenv("MAX_CHARS_PER_POST", "9000"))
     RETRY_ATTEMPTS: int = int(os.getenv("RETRY_ATTEMPTS", "1"))
+    # Posts in flight against Ollama; follows the server's parallel slots when set here too.
+    CONCURRENCY: int = max(1, int(os.getenv("CONCURRENCY", os.getenv("OLLAMA_NUM_PARALLEL", "4"))))
 
 # -----------------------------
 # Output schema (Pydantic v2)
@@ -84,39 +102,37 @@ def select_top_comments(comments: List[Dict], max_count: int) -> List[Dict]:
         comment for comment in comments
         if isinstance(comment, dict) and comment.get("body") and comment.get("score") is not None
     ]
-    clean_comments.sort(key=lambda comment: int(comment.get("score", 0)), reverse=True)
-    return clean_comments[:max_count]
+    # Partial top-k selection; same order as a stable descending sort
+    return heapq.nlargest(max_count, clean_comments, key=lambda comment: int(comment.get("score", 0)))
+
+# The prompt is sent whitespace-collapsed, so the fixed text is stored that way.
+PROMPT_HEADER = (
+    "You are an expert menswear editor. Extract concrete, atomic style rules from this discussion. "
+    "Focus on durable rules (fit, proportion, color, formality), not product shilling. "
+    "Post:"
+)
+PROMPT_FOOTER = "For each rule, include at least one citation snippet (<=240 chars) with the comment_id or post_id."
 
 def compose_prompt(post_record: Dict) -> str:
     # Build the model prompt for a single post.
-    title = clean_text_block(post_record.get("title", ""), 300)
-    post_id = post_record.get("post_id", "")
-    selftext = clean_text_block(post_record.get("selftext", ""), 1200)
+    # Pieces are already collapsed, so one space-join replaces re-collapsing the whole prompt.
+    # rstrip() drops the space a truncation can leave at the cut.
+    title = clean_text_block(post_record.get("title", ""), 300).rstrip()
+    post_id = " ".join(str(post_record.get("post_id", "")).split())
+    selftext = clean_text_block(post_record.get("selftext", ""), 1200).rstrip()
 
+    pieces = [PROMPT_HEADER, "- id:", post_id, "- title:", title, "- selftext:", selftext, "Top comments:"]
     top_comments = select_top_comments(post_record.get("comments", []), AppConfig.TOP_K_COMMENTS)
-    comment_summaries = []
     for comment in top_comments:
         body = clean_text_block(comment.get("body", ""), 600)
         if not body or body.lower() == "[deleted]":
             continue
-        comment_summaries.append(f"- ({comment.get('score')}↑) [{comment.get('comment_id', '')}] {body}")
-
-    comment_section = "\n".join(comment_summaries)
-
-    prompt = f"""You are an expert menswear editor. Extract concrete, atomic style rules from this discussion.
-Focus on durable rules (fit, proportion, color, formality), not product shilling.
-
-Post:
-- id: {post_id}
-- title: {title}
-- selftext: {selftext}
+        pieces.append(" ".join(f"- ({comment.get('score')}↑) [{comment.get('comment_id', '')}]".split()))
+        pieces.append(body.rstrip())
+    pieces.append(PROMPT_FOOTER)
 
-Top comments:
-{comment_section}
-
-For each rule, include at least one citation snippet (<=240 chars) with the comment_id or post_id.
-"""
-    return clean_text_block(prompt, AppConfig.MAX_CHARS_PER_POST)
+    prompt = " ".join(piece for piece in pieces if piece)
+    return prompt[:AppConfig.MAX_CHARS_PER_POST]
 
 SYSTEM_MSG = {
     "role": "system",
@@ -127,12 +143,15 @@ SYSTEM_MSG = {
     ),
 }
 
+# Built once; pydantic regenerates the schema on every model_json_schema() call.
+RULE_DIGEST_SCHEMA = RuleDigest.model_json_schema()
+
 def call_ollama(model: str, prompt: str) -> str:
     # Call Ollama and return the raw response.
     response = ollama.chat(
         model=model,
         messages=[SYSTEM_MSG, {"role": "user", "content": prompt}],
-        format=RuleDigest.model_json_schema(),
+        format=RULE_DIGEST_SCHEMA,
         options={"temperature": AppConfig.TEMPERATURE},
     )
     return response.message.content
@@ -160,20 +179,25 @@ def assign_rule_ids(digest: RuleDigest) -> RuleDigest:
             rule.rule_id = build_rule_id(rule.text, digest.source_post_id)
     return digest
 
-def append_jsonl_record(path: str, obj: dict):
-    # Append an object as one JSONL line.
-    with open(path, "a", encoding="utf-8") as jsonl_file:
-        jsonl_file.write(json.dumps(obj, ensure_ascii=False) + "\n")
+def append_jsonl_record(jsonl_file: BinaryIO, obj: dict):
+    # Append an object as one JSONL line to an open binary file.
+    if orjson is not None:
+        jsonl_file.write(orjson.dumps(obj) + b"\n")
+    else:
+        jsonl_file.write(json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n")
+    # Flush per record so a resumed run sees everything written so far.
+    jsonl_file.flush()
 
 def load_existing_rule_ids(path: str) -> set:
     # Gather rule IDs from an existing JSONL file to avoid duplicates.
     existing_ids = set()
     if not os.path.exists(path):
         return existing_ids
-    with open(path, "r", encoding="utf-8") as jsonl_file:
+    load_record = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as jsonl_file:
         for line in jsonl_file:
             try:
-                record = json.loads(line)
+                record = load_record(line)
                 for rule in record.get("rules", []):
                     if rule_id := rule.get("rule_id"):
                         existing_ids.add(rule_id)
@@ -181,59 +205,112 @@ def load_existing_rule_ids(path: str) -> set:
                 continue
     return existing_ids
 
+def iter_input_posts(input_file: BinaryIO) -> Iterator[Dict]:
+    # Yield posts from a top-level JSON array, streaming it when ijson is available.
+    if ijson is None:
+        raw = input_file.read()
+        posts = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        if not isinstance(posts, list):
+            raise ValueError("Input must be a list of posts.")
+        return iter(posts)
+
+    # ijson only fails once iteration starts, so check the array up front.
+    first_char = b""
+    while not first_char:
+        chunk = input_file.read(4096)
+        if not chunk:
+            break
+        first_char = chunk.lstrip()[:1]  # all-whitespace chunks give b"", so keep reading
+    if first_char != b"[":
+        raise ValueError("Input must be a list of posts.")
+    input_file.seek(0)
+    return ijson.items(input_file, "item", use_float=True)
+
 # -----------------------------
 # CLI / main
 # -----------------------------
 def process_post_file(input_path: str, out_path: str, model: str):
     # Read posts, extract rules, and write results to JSONL.
     try:
-        with open(input_path, "r", encoding="utf-8") as input_file:
-            posts_to_process = json.load(input_file)
-        if not isinstance(posts_to_process, list):
-            print("Input must be a list of posts.", file=sys.stderr)
-            sys.exit(1)
-    except (FileNotFoundError, json.JSONDecodeError) as error:
+        input_file = open(input_path, "rb")
+    except FileNotFoundError as error:
         print(f"Error reading input file: {error}", file=sys.stderr)
         sys.exit(1)
 
+    with input_file:
+        try:
+            posts_to_process = iter_input_posts(input_file)
+        except ValueError as error:  # includes json.JSONDecodeError
+            print(f"Error reading input file: {error}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            process_posts(posts_to_process, out_path, model)
+        except INPUT_STREAM_ERRORS as error:
+            # Every completed post has already been appended and flushed to out_path.
+            print(f"Error reading input file: {error}", file=sys.stderr)
+            sys.exit(1)
+
+def iter_post_digests(posts_to_process: Iterator[Dict], model: str) -> Iterator[Tuple[int, Dict, Optional[RuleDigest]]]:
+    # Run up to CONCURRENCY model calls at once and yield results in input order.
+    with ThreadPoolExecutor(max_workers=AppConfig.CONCURRENCY) as pool:
+        in_flight = deque()
+        stream_error = None
+        try:
+            for post_index, post_record in enumerate(posts_to_process):
+                prompt = compose_prompt(post_record)
+                in_flight.append((post_index, post_record, pool.submit(validate_with_retries, model, prompt)))
+                if len(in_flight) > AppConfig.CONCURRENCY:
+                    post_index, post_record, future = in_flight.popleft()
+                    yield post_index, post_record, future.result()
+        except INPUT_STREAM_ERRORS as error:
+            # Hand back the posts already sent to the model before reporting the bad input.
+            stream_error = error
+        while in_flight:
+            post_index, post_record, future = in_flight.popleft()
+            yield post_index, post_record, future.result()
+        if stream_error is not None:
+            raise stream_error
+
+def process_posts(posts_to_process: Iterator[Dict], out_path: str, model: str):
+    # Extract rules from each post and append the new ones to JSONL.
+    # Only the model calls run concurrently; dedupe and writes stay on this thread.
     existing_rule_ids = load_existing_rule_ids(out_path)
     processed_post_total = 0
     new_rule_total = 0
 
-    for post_index, post_record in enumerate(posts_to_process):
-        if AppConfig.MAX_POSTS and processed_post_total >= AppConfig.MAX_POSTS:
-            break
-
-        post_id = str(post_record.get("post_id", f"post_{post_index}"))
-        prompt = compose_prompt(post_record)
+    if AppConfig.MAX_POSTS:
+        posts_to_process = islice(posts_to_process, AppConfig.MAX_POSTS)
 
-        rule_digest = validate_with_retries(model, prompt)
-        if not rule_digest:
-            print(f"[skip] {post_id}: Failed to get a valid response from the model.", file=sys.stderr)
-            processed_post_total += 1
-            continue
+    # One handle for the whole run instead of an open/close per record.
+    with open(out_path, "ab") as jsonl_file:
+        for post_index, post_record, rule_digest in iter_post_digests(posts_to_process, model):
+            post_id = str(post_record.get("post_id", f"post_{post_index}"))
+            if not rule_digest:
+                print(f"[skip] {post_id}: Failed to get a valid response from the model.", file=sys.stderr)
+                processed_post_total += 1
+                continue
 
-        rule_digest.source_post_id = post_id
-        rule_digest.source_title = post_record.get("title", "")
-        rule_digest.source_url = post_record.get("url")
-        rule_digest.extracted_at = current_iso_timestamp()
-        rule_digest = assign_rule_ids(rule_digest)
+            rule_digest.source_post_id = post_id
+            rule_digest.source_title = post_record.get("title", "")
+            rule_digest.source_url = post_record.get("url")
+            rule_digest.extracted_at = current_iso_timestamp()
+            rule_digest = assign_rule_ids(rule_digest)
 
-        novel_rules = [rule for rule in rule_digest.rules if rule.rule_id not in existing_rule_ids]
-        if not novel_rules:
-            print(f"[dupe] {post_id}: No new rules found.")
-            processed_post_total += 1
-            continue
+            novel_rules = [rule for rule in rule_digest.rules if rule.rule_id not in existing_rule_ids]
+            if not novel_rules:
+                print(f"[dupe] {post_id}: No new rules found.")
+                processed_post_total += 1
+                continue
 
-        jsonl_record = rule_digest.model_dump()
-        jsonl_record["rules"] = [rule.model_dump() for rule in novel_rules]
-        for rule_entry in novel_rules:
-            existing_rule_ids.add(rule_entry.rule_id)
-        append_jsonl_record(out_path, jsonl_record)
+            jsonl_record = rule_digest.model_dump()
+            jsonl_record["rules"] = [rule.model_dump() for rule in novel_rules]
+            for rule_entry in novel_rules:
+                existing_rule_ids.add(rule_entry.rule_id)
+            append_jsonl_record(jsonl_file, jsonl_record)
 
-        new_rule_total += len(novel_rules)
-        processed_post_total += 1
-        print(f"[ok] {post_id}: Added {len(novel_rules)} new rules. Total saved: {len(existing_rule_ids)}")
+            new_rule_total += len(novel_rules)
+            processed_post_total += 1
+            print(f"[ok] {post_id}: Added {len(novel_rules)} new rules. Total saved: {len(existing_rule_ids)}")
 
     print(f"\nProcessing complete. Processed {processed_post_total} posts and saved {new_rule_total} new rules to {out_path}.")
 
@@ -1,15 +1,23 @@
 import json
+import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = PROJECT_ROOT / "data"
 
+_WS_RE = re.compile(r'\s+')
+
 def load_json(filepath: Path) -> Any:
     """Load JSON file with error handling."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        raw = Path(filepath).read_bytes()
+        return orjson.loads(raw) if orjson else json.loads(raw)
     except FileNotFoundError:
         return None
     except json.JSONDecodeError as e:
@@ -42,5 +50,4 @@ def get_top_comment(post: Dict) -> Optional[Dict]:
 
 def normalize_whitespace(text: str) -> str:
     """Collapse multiple whitespace into single space."""
-    import re
-    return re.sub(r'\s+', ' ', text).strip()
+    return _WS_RE.sub(' ', text).strip()
@@ -1,10 +1,13 @@
 import json
+import orjson
 import praw
 import prawcore
 import configparser
 import signal
 import sys
 import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -16,17 +19,20 @@ class ScraperConfig:
     MIN_COMMENT_SCORE: int = 10
     POST_LIMIT: int = 0  # 0 for no limit (up to 1000)
     TIME_FILTER: str = "all"  # "all", "year", "month", etc.
+    COMMENT_FETCH_WORKERS: int = 8  # Submissions whose comment trees are fetched concurrently
 
     BASE_DIR: Path = Path(__file__).resolve().parent
     CONFIG_PATH: Path = BASE_DIR.parent / "config" / "config.ini"
     OUTPUT_DIR: Path = BASE_DIR.parent / "data"
     OUTPUT_FILENAME: Path = OUTPUT_DIR / "reddit_fashion_data.json"
+    APPEND_LOG_FILENAME: Path = OUTPUT_DIR / "reddit_fashion_data.jsonl"
     TARGET_SUBREDDITS_PATH: Path = BASE_DIR / "target_subreddits.json"
     SEARCH_QUERIES_PATH: Path = BASE_DIR / "search_queries.json"
 
 _active_scrape_data = {}
 _save_attempts = 0
 _processed_post_count = 0
+_thread_state = threading.local()
 
 
 def read_json_data(path: Path, expected_type):
@@ -79,12 +85,14 @@ def write_scrape_data(scrape_snapshot: dict, target_path: Path, save_label: str
     # Persist scraping progress, keeping a backup of the last file.
     global _save_attempts
     try:
+        encoded = orjson.dumps(scrape_snapshot, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
         if target_path.exists():
             backup_path = target_path.with_suffix('.json.backup')
             target_path.rename(backup_path)
 
-        with open(target_path, 'w', encoding='utf-8') as output_file:
-            json.dump(scrape_snapshot, output_file, indent=4, ensure_ascii=False)
+        target_path.write_bytes(encoded)
+        # Everything in the append log is now part of the merged file.
+        ScraperConfig.APPEND_LOG_FILENAME.unlink(missing_ok=True)
 
         _save_attempts += 1
         total_posts = sum(len(posts) for posts in scrape_snapshot.values())
@@ -95,8 +103,7 @@ def write_scrape_data(scrape_snapshot: dict, target_path: Path, save_label: str
         print(f"\n!!! ERROR saving data: {error}")
         try:
             emergency_path = target_path.with_name(f"emergency_save_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-            with open(emergency_path, 'w', encoding='utf-8') as emergency_file:
-                json.dump(scrape_snapshot, emergency_file, indent=4, ensure_ascii=False)
+            emergency_path.write_bytes(orjson.dumps(scrape_snapshot, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             print(f"Emergency save successful: {emergency_path}")
             return True
         except Exception as emergency_error:
@@ -104,6 +111,41 @@ def write_scrape_data(scrape_snapshot: dict, target_path: Path, save_label: str
             return False
 
 
+def append_posts_to_log(subreddit_name: str, posts: list):
+    # Record newly scraped posts as JSON lines; cost is proportional to the new posts only.
+    with open(ScraperConfig.APPEND_LOG_FILENAME, 'ab') as log_file:
+        log_file.writelines(
+            orjson.dumps({"subreddit": subreddit_name, "post": post}) + b"\n" for post in posts
+        )
+
+
+def replay_append_log(scrape_data: dict) -> int:
+    # Merge posts left in the append log by a run that never reached its final save.
+    log_path = ScraperConfig.APPEND_LOG_FILENAME
+    if not log_path.exists():
+        return 0
+
+    known_ids = {
+        subreddit_name: {post["post_id"] for post in posts}
+        for subreddit_name, posts in scrape_data.items()
+    }
+    recovered = 0
+    with open(log_path, 'rb') as log_file:
+        for line in log_file:
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue  # A line cut short by a crash
+            subreddit_name, post = entry["subreddit"], entry["post"]
+            seen = known_ids.setdefault(subreddit_name, set())
+            if post["post_id"] in seen:
+                continue
+            scrape_data.setdefault(subreddit_name, []).append(post)
+            seen.add(post["post_id"])
+            recovered += 1
+    return recovered
+
+
 def handle_emergency_shutdown(signal_number=None, frame=None):
     # Save progress before exiting when interrupted.
     print("\n\n" + "="*60)
@@ -125,31 +167,68 @@ def handle_emergency_shutdown(signal_number=None, frame=None):
     sys.exit(0)
 
 
-def create_reddit_client():
-    # Create a Reddit client using credentials from config.ini.
+def read_reddit_credentials():
+    # Read the [DEFAULT] credentials section from config.ini.
     config_parser = configparser.ConfigParser()
     if not ScraperConfig.CONFIG_PATH.exists():
         print(f"Error: Configuration file not found at {ScraperConfig.CONFIG_PATH}.")
         return None
 
     config_parser.read(ScraperConfig.CONFIG_PATH)
+    return config_parser["DEFAULT"]
+
+
+def build_reddit(creds) -> praw.Reddit:
+    return praw.Reddit(
+        client_id=creds["client_id"],
+        client_secret=creds["client_secret"],
+        username=creds["username"],
+        password=creds["password"],
+        user_agent=creds["user_agent"],
+    )
+
+
+def create_reddit_client():
+    # Create a Reddit client using credentials from config.ini.
+    creds = read_reddit_credentials()
+    if creds is None:
+        return None
 
     try:
-        creds = config_parser["DEFAULT"]
-        reddit = praw.Reddit(
-            client_id=creds["client_id"],
-            client_secret=creds["client_secret"],
-            username=creds["username"],
-            password=creds["password"],
-            user_agent=creds["user_agent"],
-        )
+        reddit = build_reddit(creds)
         user = reddit.user.me()
         print(f"Authenticated as u/{user.name}")
         return reddit
     except (KeyError, Exception) as e:
         print(f"Authentication failed: {e}")
         return None
-    
+
+
+def init_comment_worker(creds):
+    # PRAW instances are not thread safe, so each fetch thread gets its own.
+    _thread_state.reddit = build_reddit(creds)
+
+
+def fetch_top_comments(submission_id: str) -> list:
+    # Fetch a submission's comment tree and keep comments above the score threshold.
+    # A failed fetch only costs this post its comments, not the rest of its batch.
+    try:
+        submission = _thread_state.reddit.submission(id=submission_id)
+        submission.comment_sort = "top"
+        submission.comments.replace_more(limit=0)
+        return [
+            {
+                "comment_id": comment.id,
+                "body": comment.body,
+                "score": comment.score
+            }
+            for comment in submission.comments.list()
+            if comment.score >= ScraperConfig.MIN_COMMENT_SCORE
+        ]
+    except (prawcore.exceptions.PrawcoreException, praw.exceptions.PRAWException) as e:
+        print(f"      [!] Comment fetch failed for {submission_id}: {e}")
+        return []
+
 
 def read_existing_data(filepath: Path) -> dict:
     # Load any prior scrape output for incremental updates.
@@ -166,7 +245,8 @@ def read_existing_data(filepath: Path) -> dict:
     except (json.JSONDecodeError, IOError) as e:
         print(f"Error reading {filepath}: {e}. Starting fresh.")
         return {}
-    
+
+
 def main():
     global _active_scrape_data, _processed_post_count
 
@@ -180,6 +260,7 @@ def main():
     reddit = create_reddit_client()
     if not reddit:
         return
+    creds = read_reddit_credentials()
 
     if not TARGET_SUBREDDITS:
         print(f"Error: No target subreddits loaded from {ScraperConfig.TARGET_SUBREDDITS_PATH}.")
@@ -192,8 +273,27 @@ def main():
     ScraperConfig.OUTPUT_DIR.mkdir(exist_ok=True)
 
     all_scraped_data = read_existing_data(ScraperConfig.OUTPUT_FILENAME)
+    recovered = replay_append_log(all_scraped_data)
+    if recovered:
+        print(f"Recovered {recovered} posts from {ScraperConfig.APPEND_LOG_FILENAME}")
     _active_scrape_data = all_scraped_data
 
+    comment_pool = ThreadPoolExecutor(
+        max_workers=ScraperConfig.COMMENT_FETCH_WORKERS,
+        initializer=init_comment_worker,
+        initargs=(creds,),
+    )
+
+    def flush_pending(subreddit_name: str, pending: list, saved_posts: list):
+        # Fetch comment trees for the queued posts concurrently, then store them in order.
+        comment_lists = comment_pool.map(fetch_top_comments, [post["post_id"] for post in pending])
+        for post_data, comments in zip(pending, comment_lists):
+            post_data["comments"] = comments
+            print(f"      -> Saved {len(comments)} comments for {post_data['post_id']}.")
+            saved_posts.append(post_data)
+        append_posts_to_log(subreddit_name, pending)
+        pending.clear()
+
     try:
         for subreddit_name in TARGET_SUBREDDITS:
             print(f"\n--- Scraping r/{subreddit_name} ---")
@@ -212,6 +312,7 @@ def main():
             known_post_ids = {post["post_id"] for post in saved_posts}
 
             new_posts_count = 0
+            pending_posts = []
 
             for query_name, query_string in SEARCH_QUERIES.items():
                 print(f"\n  [Query: {query_name}]")
@@ -245,25 +346,14 @@ def main():
                         "comments": []
                     }
 
-                    submission.comment_sort = "top"
-                    submission.comments.replace_more(limit=0)
-
-                    saved_comment_count = 0
-                    for comment in submission.comments.list():
-                        if comment.score >= ScraperConfig.MIN_COMMENT_SCORE:
-                            post_data["comments"].append({
-                                "comment_id": comment.id,
-                                "body": comment.body,
-                                "score": comment.score
-                            })
-                            saved_comment_count += 1
-
-                    print(f"      -> Saved {saved_comment_count} comments.")
-                    saved_posts.append(post_data)
+                    pending_posts.append(post_data)
                     known_post_ids.add(submission.id)
+                    if len(pending_posts) >= ScraperConfig.COMMENT_FETCH_WORKERS:
+                        flush_pending(subreddit_name, pending_posts, saved_posts)
+
+                flush_pending(subreddit_name, pending_posts, saved_posts)
 
             print(f"\n--- Finished r/{subreddit_name}: Found {new_posts_count} new posts. Total: {len(saved_posts)} ---")
-            write_scrape_data(all_scraped_data, ScraperConfig.OUTPUT_FILENAME, save_label="auto")
 
         write_scrape_data(all_scraped_data, ScraperConfig.OUTPUT_FILENAME, save_label="final")
 
@@ -283,6 +373,8 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        comment_pool.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":